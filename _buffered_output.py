@@ -0,0 +1,15 @@
+"""Buffered stdout for the console test scripts"""
+import io
+import sys
+from contextlib import contextmanager, redirect_stdout
+
+
+@contextmanager
+def buffered_stdout():
+    """Collect stdout in memory and write it once on exit, even if the run fails"""
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
@@ -0,0 +1,37 @@
+"""Shared constants and helpers for the FMP probe scripts"""
+import os
+
+import httpx
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Read from the environment only; there is deliberately no fallback key
+API_KEY = os.getenv("FMP_API_KEY", "")
+BASE_URL = "https://financialmodelingprep.com/stable"
+
+
+def require_api_key() -> None:
+    """Exit with a clear message when FMP_API_KEY is unset"""
+    if not API_KEY:
+        raise SystemExit("FMP_API_KEY is not set; export it to run the FMP probe scripts.")
+
+
+def parse_json(response: httpx.Response):
+    """Decode a response body, using orjson when it is installed"""
+    return json_loads(response.content)
+
+
+def error_preview(response: httpx.Response, limit: int = 200) -> str:
+    """Decode only the first `limit` bytes of an error body"""
+    return response.content[:limit].decode("utf-8", "replace")
+
+
+async def probe_profile(client: httpx.AsyncClient, symbol: str) -> httpx.Response:
+    """Fetch the /stable/profile record for a symbol"""
+    return await client.get(
+        f"{BASE_URL}/profile",
+        params={"symbol": symbol, "apikey": API_KEY}
+    )
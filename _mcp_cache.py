@@ -0,0 +1,48 @@
+"""On-disk response cache for the MCP real-data test scripts"""
+import functools
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / ".cache" / "mcp"
+TTL_SECONDS = 7 * 24 * 3600
+
+# MCP_TEST_LIVE=1 bypasses the cache and always hits the providers
+LIVE = os.getenv("MCP_TEST_LIVE", "0") == "1"
+
+
+def _cache_path(fetch_func_name: str, args: tuple, kwargs: dict) -> Path:
+    """Key on endpoint plus call arguments (symbol, timeframe, limit, ...)"""
+    raw = repr((fetch_func_name, args, sorted(kwargs.items())))
+    return CACHE_DIR / f"{hashlib.md5(raw.encode()).hexdigest()}.pkl"
+
+
+def cached_fetch(fetch_with_fallback):
+    """Wrap a factory's fetch_with_fallback so repeat runs within TTL read from disk"""
+    if LIVE:
+        return fetch_with_fallback
+
+    @functools.wraps(fetch_with_fallback)
+    async def wrapper(fetch_func_name: str, *args, **kwargs):
+        path = _cache_path(fetch_func_name, args, kwargs)
+        try:
+            with path.open("rb") as f:
+                stored_at, value = pickle.load(f)
+            if time.time() - stored_at < TTL_SECONDS:
+                return value
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        # Errors propagate uncached so the next run retries the provider.
+        # So does None: get_fundamentals reports a failed lookup that way.
+        value = await fetch_with_fallback(fetch_func_name, *args, **kwargs)
+        if value is None:
+            return value
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            pickle.dump((time.time(), value), f)
+        return value
+
+    return wrapper
@@ -11,12 +11,15 @@ Design Principles:
 """
 
 from typing import Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
 
 @dataclass
 class TriggerState:
@@ -27,6 +30,7 @@ class TriggerState:
     trigger_count: int
     last_signal_hash: Optional[str] = None  # Hash of signal to detect changes
     last_user_id: Optional[str] = None      # User who last triggered
+    last_triggered_ns: int = 0              # time.monotonic_ns() at trigger, for cooldowns
 
 
 @dataclass
@@ -172,9 +176,9 @@ class MCPTriggerManager:
             self._update_state(ticker, opportunity_type, volatility, signal_hash, user_id)
             return True
         
-        # Check cooldown
-        time_since_last = datetime.now() - state.last_triggered
-        in_cooldown = time_since_last < timedelta(minutes=self.cooldown_minutes)
+        # Check cooldown (monotonic, so wall-clock jumps can't skew it)
+        elapsed_ns = time.monotonic_ns() - state.last_triggered_ns
+        in_cooldown = elapsed_ns < self.cooldown_minutes * _NS_PER_MINUTE
         
         if in_cooldown:
             # Check if any override conditions met
@@ -206,7 +210,7 @@ class MCPTriggerManager:
             # In cooldown, no overrides
             logger.debug(
                 f"⏳ {ticker} in cooldown: "
-                f"{time_since_last.total_seconds():.0f}s / "
+                f"{elapsed_ns / 1e9:.0f}s / "
                 f"{self.cooldown_minutes * 60}s - no trigger"
             )
             return False
@@ -214,7 +218,7 @@ class MCPTriggerManager:
         # Cooldown expired → trigger
         logger.info(
             f"✅ Cooldown expired for {ticker} "
-            f"({time_since_last.total_seconds():.0f}s) - trigger MCP"
+            f"({elapsed_ns / 1e9:.0f}s) - trigger MCP"
         )
         self._update_state(ticker, opportunity_type, volatility, signal_hash, user_id)
         return True
@@ -237,7 +241,8 @@ class MCPTriggerManager:
             last_volatility=volatility,
             trigger_count=trigger_count,
             last_signal_hash=signal_hash,
-            last_user_id=user_id
+            last_user_id=user_id,
+            last_triggered_ns=time.monotonic_ns()
         )
     
     def should_trigger_on_login(
@@ -16,13 +16,17 @@ class DataSource(Enum):
     UNAVAILABLE = "Unavailable"
 
 
-@dataclass
+@dataclass(slots=True)
 class FundamentalDataResult:
     """
     Result from fundamental data fetch
     
     Explicitly tracks data source and completeness.
     Frontend can show "Data from FMP" or "Fundamental data unavailable"
+    
+    Completeness is stored on the instance (computed in __post_init__ and
+    refreshed by adapters after they populate fields), so repeated reads
+    of fields_available / completeness_percent are plain slot lookups.
     """
     ticker: str
     source: DataSource
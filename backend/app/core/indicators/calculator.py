@@ -38,7 +38,7 @@ class IndicatorCalculator:
             return None
         
         # Extract close prices and convert to numpy array
-        closes = np.array([p.close for p in prices])
+        closes = np.fromiter((p.close for p in prices), dtype=np.float64, count=len(prices))
         latest_timestamp = prices[-1].timestamp
         current_price = prices[-1].close
         
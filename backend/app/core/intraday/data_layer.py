@@ -12,9 +12,9 @@ import pandas as pd
 import numpy as np
 
 
-@dataclass
+@dataclass(slots=True)
 class IntradayMetrics:
-    """Single source of truth for intraday stock data"""
+    """Single source of truth for intraday stock data (slotted, no per-instance __dict__)"""
     ticker: str
     timestamp: datetime
     
@@ -51,7 +51,7 @@ class IntradayMetrics:
     recent_low_20d: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioPosition:
     """User's holdings data"""
     ticker: str
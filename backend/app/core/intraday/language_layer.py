@@ -15,12 +15,23 @@ ALWAYS use:
 - No jargon without context
 """
 
+import re
 from typing import Dict, List
 from .method_layer import Detection, DetectionTag
 from .regime_mcp import MarketContext, RegimeContext
 from .data_layer import IntradayMetrics
 
 
+FORBIDDEN_WORDS = (
+    "buy now", "sell now", "immediately", "must",
+    "will", "guaranteed", "target", "stop loss",
+    "get in", "get out", "act now"
+)
+
+# Single alternation so validate_output scans the text once
+_FORBIDDEN_RE = re.compile("|".join(map(re.escape, FORBIDDEN_WORDS)))
+
+
 class LanguageFormatter:
     """
     Formats technical data into beginner-friendly language.
@@ -31,13 +42,6 @@ class LanguageFormatter:
     - Readable (minimal jargon)
     """
     
-    def __init__(self):
-        self.forbidden_words = [
-            "buy now", "sell now", "immediately", "must", 
-            "will", "guaranteed", "target", "stop loss",
-            "get in", "get out", "act now"
-        ]
-    
     def format_daily_overview(self, detection: Detection) -> Dict:
         """
         Format for "Today's Watch" homepage card.
@@ -278,13 +282,7 @@ class LanguageFormatter:
         
         Returns True if clean, False if violations found.
         """
-        text_lower = text.lower()
-        
-        for forbidden in self.forbidden_words:
-            if forbidden in text_lower:
-                return False
-        
-        return True
+        return _FORBIDDEN_RE.search(text.lower()) is None
     
     def format_batch_overview(
         self, 
@@ -105,6 +105,26 @@ class MethodDetector:
             severity=severity
         )
     
+    def detect_all_batch(
+        self,
+        metrics_list: List[IntradayMetrics],
+        red_candles_counts: Optional[List[int]] = None
+    ) -> List[Detection]:
+        """
+        Run market-data detection methods for multiple stocks.
+        
+        Portfolio risk needs per-user positions, so it is left to detect_all.
+        Raises ValueError if red_candles_counts and metrics_list differ in length.
+        """
+        if red_candles_counts is None:
+            red_candles_counts = [0] * len(metrics_list)
+        
+        detect = self.detect_all
+        return [
+            detect(metrics, red_candles_count=red_candles)
+            for metrics, red_candles in zip(metrics_list, red_candles_counts, strict=True)
+        ]
+    
     def _detect_trend_stress(
         self, 
         metrics: IntradayMetrics,
@@ -8,6 +8,7 @@ MarketRegimeContext enrichment that runs AFTER signals.
 ⚠️ CRITICAL: Context does NOT modify signals
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
@@ -154,7 +155,7 @@ class MCPProviderFactory:
                 # Get ticker data for volume/volatility analysis
                 import yfinance as yf
                 ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="1d", interval="15m")
+                hist = await asyncio.to_thread(ticker.history, period="1d", interval="15m")
                 
                 if not hist.empty and len(hist) > 0:
                     context.intraday_data_available = True
@@ -13,6 +13,7 @@ Features:
 No API key required (uses yfinance library).
 """
 
+import asyncio
 import yfinance as yf
 import logging
 from typing import List, Optional
@@ -66,7 +67,8 @@ class YahooFinanceMCPProvider(MCPProvider):
         
         try:
             ticker = yf.Ticker(index_symbol)
-            info = ticker.info
+            # yfinance is blocking; keep the HTTP round trip off the event loop
+            info = await asyncio.to_thread(lambda: ticker.info)
             
             if not info:
                 raise MCPDataUnavailable(f"No data for {index_symbol}")
@@ -91,7 +93,7 @@ class YahooFinanceMCPProvider(MCPProvider):
         """Check if Yahoo Finance is accessible"""
         try:
             ticker = yf.Ticker("^GSPC")  # S&P 500
-            info = ticker.info
+            info = await asyncio.to_thread(lambda: ticker.info)
             return info is not None and len(info) > 0
         except Exception as e:
             logger.error(f"Yahoo Finance health check failed: {e}")
@@ -107,7 +109,7 @@ class YahooFinanceMCPProvider(MCPProvider):
         try:
             clean_symbol = symbol.split('.')[0]
             ticker = yf.Ticker(clean_symbol)
-            info = ticker.info
+            info = await asyncio.to_thread(lambda: ticker.info)
             
             if not info:
                 return None
@@ -10,6 +10,9 @@ Tests the improved experimental agent with:
 """
 
 import asyncio
+import logging
+import os
+import re
 import sys
 from datetime import datetime, timedelta
 
@@ -17,17 +20,24 @@ sys.path.append("backend")
 
 from app.core.experimental.trading_agent import ExperimentalTradingAgent
 
+BAR = "=" * 80
+
+# Per-thesis diagnostics are only rendered with TEST_VERBOSE=1
+VERBOSE = os.getenv("TEST_VERBOSE", "0") == "1"
+log = logging.getLogger(__name__)
+
+OVER_ANALYSIS_RE = re.compile(r"over-analysis|trust your first", re.IGNORECASE)
+
 
 async def test_index_override():
     """Test index override reducing confidence"""
-    print("\n" + "="*80)
-    print("TEST 1: Index Override")
-    print("="*80)
+    print(f"\n{BAR}\nTEST 1: Index Override\n{BAR}")
     
     agent = ExperimentalTradingAgent(enabled=True)
     
     # Long signal but bearish index
-    thesis = agent.analyze_setup(
+    thesis = await asyncio.to_thread(
+        agent.analyze_setup,
         ticker="TCS",
         current_price=3500.0,
         ohlcv={
@@ -56,13 +66,13 @@ async def test_index_override():
     )
     
     if thesis:
-        print(f"\n✅ Thesis Generated:")
-        print(f"   Ticker: {thesis.ticker}")
-        print(f"   Bias: {thesis.bias}")
-        print(f"   Confidence: {thesis.confidence}%")
-        print(f"   Index Alignment: {thesis.index_alignment}")
-        print(f"   Adjustments: {thesis.confidence_adjustments}")
-        print(f"   Risk Notes: {thesis.risk_notes}")
+        log.debug("\n✅ Thesis Generated:")
+        log.debug("   Ticker: %s", thesis.ticker)
+        log.debug("   Bias: %s", thesis.bias)
+        log.debug("   Confidence: %s%%", thesis.confidence)
+        log.debug("   Index Alignment: %s", thesis.index_alignment)
+        log.debug("   Adjustments: %s", thesis.confidence_adjustments)
+        log.debug("   Risk Notes: %s", thesis.risk_notes)
         
         # Verify index adjustment was applied
         if thesis.bias in ["long", "short"]:  # Only if there's a trade
@@ -79,14 +89,13 @@ async def test_index_override():
 
 async def test_liquidity_filter():
     """Test liquidity filter forcing scalp/no trade"""
-    print("\n" + "="*80)
-    print("TEST 2: Liquidity Filter")
-    print("="*80)
+    print(f"\n{BAR}\nTEST 2: Liquidity Filter\n{BAR}")
     
     agent = ExperimentalTradingAgent(enabled=True)
     
     # Long signal but very low volume
-    thesis = agent.analyze_setup(
+    thesis = await asyncio.to_thread(
+        agent.analyze_setup,
         ticker="SMALLCAP",
         current_price=150.0,
         ohlcv={
@@ -107,12 +116,12 @@ async def test_liquidity_filter():
     )
     
     if thesis:
-        print(f"\n✅ Thesis Generated:")
-        print(f"   Ticker: {thesis.ticker}")
-        print(f"   Bias: {thesis.bias}")
-        print(f"   Confidence: {thesis.confidence}%")
-        print(f"   Volume Analysis: {thesis.volume_analysis}")
-        print(f"   Risk Notes: {thesis.risk_notes}")
+        log.debug("\n✅ Thesis Generated:")
+        log.debug("   Ticker: %s", thesis.ticker)
+        log.debug("   Bias: %s", thesis.bias)
+        log.debug("   Confidence: %s%%", thesis.confidence)
+        log.debug("   Volume Analysis: %s", thesis.volume_analysis)
+        log.debug("   Risk Notes: %s", thesis.risk_notes)
         
         # Verify bias was downgraded
         assert thesis.bias in ["scalp_only", "no_trade"], f"Expected scalp/no trade, got {thesis.bias}"
@@ -125,15 +134,14 @@ async def test_liquidity_filter():
 
 async def test_signal_freshness():
     """Test signal freshness warnings"""
-    print("\n" + "="*80)
-    print("TEST 3: Signal Freshness")
-    print("="*80)
+    print(f"\n{BAR}\nTEST 3: Signal Freshness\n{BAR}")
     
     agent = ExperimentalTradingAgent(enabled=True)
     
     # Analyze once with strong trending setup
     print("\nFirst analysis (fresh signal):")
-    thesis1 = agent.analyze_setup(
+    thesis1 = await asyncio.to_thread(
+        agent.analyze_setup,
         ticker="INFY",
         current_price=1500.0,
         ohlcv={
@@ -158,9 +166,9 @@ async def test_signal_freshness():
     )
     
     if thesis1:
-        print(f"   Bias: {thesis1.bias}")
-        print(f"   Signal Age: {thesis1.signal_age_minutes or 0} minutes")
-        print(f"   Risk Notes: {thesis1.risk_notes}")
+        log.debug("   Bias: %s", thesis1.bias)
+        log.debug("   Signal Age: %s minutes", thesis1.signal_age_minutes or 0)
+        log.debug("   Risk Notes: %s", thesis1.risk_notes)
     
     # Simulate time passing by manually updating last_analysis_time
     print("\nSimulating 35 minutes passing...")
@@ -168,7 +176,8 @@ async def test_signal_freshness():
     
     # Analyze again (stale signal)
     print("\nSecond analysis (stale signal):")
-    thesis2 = agent.analyze_setup(
+    thesis2 = await asyncio.to_thread(
+        agent.analyze_setup,
         ticker="INFY",
         current_price=1502.0,
         ohlcv={
@@ -193,9 +202,9 @@ async def test_signal_freshness():
     )
     
     if thesis2:
-        print(f"   Bias: {thesis2.bias}")
-        print(f"   Signal Age: {thesis2.signal_age_minutes or 0} minutes")
-        print(f"   Risk Notes: {thesis2.risk_notes}")
+        log.debug("   Bias: %s", thesis2.bias)
+        log.debug("   Signal Age: %s minutes", thesis2.signal_age_minutes or 0)
+        log.debug("   Risk Notes: %s", thesis2.risk_notes)
         
         # Verify freshness warning if trade was generated
         if thesis2.bias in ["long", "short"]:
@@ -210,16 +219,15 @@ async def test_signal_freshness():
 
 async def test_analysis_frequency():
     """Test analysis frequency guard"""
-    print("\n" + "="*80)
-    print("TEST 4: Analysis Frequency Guard")
-    print("="*80)
+    print(f"\n{BAR}\nTEST 4: Analysis Frequency Guard\n{BAR}")
     
     agent = ExperimentalTradingAgent(enabled=True)
     
     # Analyze same ticker 6 times with strong trending setup
     print("\nAnalyzing same ticker 6 times:")
     for i in range(6):
-        thesis = agent.analyze_setup(
+        thesis = await asyncio.to_thread(
+            agent.analyze_setup,
             ticker="RELIANCE",
             current_price=2850.0 + i,  # Small price variation
             ohlcv={
@@ -244,14 +252,13 @@ async def test_analysis_frequency():
         )
         
         if thesis:
-            print(f"   Analysis {i+1}: Bias={thesis.bias}, Risk notes count = {len(thesis.risk_notes)}")
+            log.debug("   Analysis %s: Bias=%s, Risk notes count = %s", i+1, thesis.bias, len(thesis.risk_notes))
             if i >= 4:  # 5th and 6th analysis should have warning
-                has_warning = any("over-analysis" in note.lower() or "trust your first" in note.lower() 
-                                  for note in thesis.risk_notes)
+                has_warning = any(OVER_ANALYSIS_RE.search(note) for note in thesis.risk_notes)
                 if has_warning:
-                    print(f"      ✅ Over-analysis warning detected")
+                    print(f"   Analysis {i+1}: ✅ Over-analysis warning detected")
                 else:
-                    print(f"      ❌ No over-analysis warning!")
+                    print(f"   Analysis {i+1}: ❌ No over-analysis warning!")
                     print(f"      Risk notes: {thesis.risk_notes}")
                 
                 assert has_warning, f"Expected over-analysis warning on attempt {i+1}"
@@ -262,14 +269,13 @@ async def test_analysis_frequency():
 
 async def test_combined_improvements():
     """Test all improvements working together"""
-    print("\n" + "="*80)
-    print("TEST 5: Combined Improvements")
-    print("="*80)
+    print(f"\n{BAR}\nTEST 5: Combined Improvements\n{BAR}")
     
     agent = ExperimentalTradingAgent(enabled=True)
     
     # Worst-case scenario: low volume, bearish index, stale signal
-    thesis = agent.analyze_setup(
+    thesis = await asyncio.to_thread(
+        agent.analyze_setup,
         ticker="WORST",
         current_price=500.0,
         ohlcv={
@@ -294,14 +300,14 @@ async def test_combined_improvements():
     )
     
     if thesis:
-        print(f"\n✅ Thesis Generated:")
-        print(f"   Ticker: {thesis.ticker}")
-        print(f"   Bias: {thesis.bias}")
-        print(f"   Confidence: {thesis.confidence}%")
-        print(f"   Adjustments: {thesis.confidence_adjustments}")
-        print(f"   Risk Notes:")
+        log.debug("\n✅ Thesis Generated:")
+        log.debug("   Ticker: %s", thesis.ticker)
+        log.debug("   Bias: %s", thesis.bias)
+        log.debug("   Confidence: %s%%", thesis.confidence)
+        log.debug("   Adjustments: %s", thesis.confidence_adjustments)
+        log.debug("   Risk Notes:")
         for note in thesis.risk_notes:
-            print(f"      - {note}")
+            log.debug("      - %s", note)
         
         # Should have multiple warnings
         assert len(thesis.risk_notes) >= 2, "Expected multiple risk notes"
@@ -317,19 +323,17 @@ async def test_combined_improvements():
 
 async def main():
     """Run all tests"""
-    print("\n🔬 TESTING ENHANCED EXPERIMENTAL AGENT")
-    print("=" * 80)
+    print(f"\n🔬 TESTING ENHANCED EXPERIMENTAL AGENT\n{BAR}")
     
     try:
+        # One at a time, so each test's report stays under its own banner
         await test_index_override()
         await test_liquidity_filter()
         await test_signal_freshness()
         await test_analysis_frequency()
         await test_combined_improvements()
         
-        print("\n" + "="*80)
-        print("✅ ALL TESTS PASSED")
-        print("="*80)
+        print(f"\n{BAR}\n✅ ALL TESTS PASSED\n{BAR}")
         
     except Exception as e:
         print(f"\n❌ TEST FAILED: {e}")
@@ -339,4 +343,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # The agent logs each thesis at INFO; keep that out of the report unless verbose
+    logging.basicConfig(level=logging.DEBUG if VERBOSE else logging.WARNING, format="%(message)s")
     asyncio.run(main())
@@ -1,14 +1,21 @@
 """Test FMP fundamentals endpoints"""
 import asyncio
+from urllib.parse import urlencode
+
 import httpx
 
+from _fmp_common import API_KEY, BASE_URL, error_preview, parse_json, probe_profile, require_api_key
+
+SYMBOL = "RELIANCE.NS"
+
+# symbol/apikey never change between endpoints, so encode them once
+COMMON_QUERY = urlencode({"symbol": SYMBOL, "apikey": API_KEY})
+NEWS_QUERY = urlencode({"symbols": SYMBOL, "apikey": API_KEY})
+
+
 async def test_fmp_endpoints():
     """Test all FMP endpoints we use"""
     
-    API_KEY = "qty5ZwSYBANWmtoWHYi1zfE8zDbKXXOV"
-    BASE_URL = "https://financialmodelingprep.com/stable"
-    SYMBOL = "RELIANCE.NS"
-    
     client = httpx.AsyncClient(timeout=30.0)
     
     print("="*80)
@@ -17,81 +24,66 @@ async def test_fmp_endpoints():
     
     # Test 1: Profile
     print("\n1. Testing /stable/profile")
-    response = await client.get(
-        f"{BASE_URL}/profile",
-        params={"symbol": SYMBOL, "apikey": API_KEY}
-    )
+    response = await probe_profile(client, SYMBOL)
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         print(f"✅ Got profile data: {data[0]['companyName'] if data else 'None'}")
     else:
-        print(f"❌ Error: {response.text[:200]}")
+        print(f"❌ Error: {error_preview(response)}")
     
     # Test 2: Ratios
     print("\n2. Testing /stable/ratios")
-    response = await client.get(
-        f"{BASE_URL}/ratios",
-        params={"symbol": SYMBOL, "apikey": API_KEY, "limit": 1}
-    )
+    response = await client.get(f"{BASE_URL}/ratios?{COMMON_QUERY}&limit=1")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         if data:
             print(f"✅ Got ratios: PE={data[0].get('priceEarningsRatio')}, ROE={data[0].get('returnOnEquity')}")
         else:
             print("❌ No ratios data")
     else:
-        print(f"❌ Error: {response.text[:200]}")
+        print(f"❌ Error: {error_preview(response)}")
     
     # Test 3: Income Statement
     print("\n3. Testing /stable/income-statement")
-    response = await client.get(
-        f"{BASE_URL}/income-statement",
-        params={"symbol": SYMBOL, "apikey": API_KEY, "limit": 2}
-    )
+    response = await client.get(f"{BASE_URL}/income-statement?{COMMON_QUERY}&limit=2")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         if data:
             print(f"✅ Got income statement: Revenue={data[0].get('revenue')}")
         else:
             print("❌ No income statement data")
     else:
-        print(f"❌ Error: {response.text[:200]}")
+        print(f"❌ Error: {error_preview(response)}")
     
     # Test 4: Key Metrics TTM
     print("\n4. Testing /stable/key-metrics-ttm")
-    response = await client.get(
-        f"{BASE_URL}/key-metrics-ttm",
-        params={"symbol": SYMBOL, "apikey": API_KEY}
-    )
+    response = await client.get(f"{BASE_URL}/key-metrics-ttm?{COMMON_QUERY}")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         if data:
             print(f"✅ Got key metrics: Market Cap={data[0].get('marketCapTTM')}")
         else:
             print("❌ No key metrics data")
     else:
-        print(f"❌ Error: {response.text[:200]}")
+        print(f"❌ Error: {error_preview(response)}")
     
     # Test 5: News
     print("\n5. Testing /stable/news/stock")
-    response = await client.get(
-        f"{BASE_URL}/news/stock",
-        params={"symbols": SYMBOL, "apikey": API_KEY, "page": 0, "limit": 5}
-    )
+    response = await client.get(f"{BASE_URL}/news/stock?{NEWS_QUERY}&page=0&limit=5")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         if data:
             print(f"✅ Got {len(data)} news articles")
             print(f"   Latest: {data[0]['title'][:60]}...")
         else:
             print("❌ No news data")
     else:
-        print(f"❌ Error: {response.text[:200]}")
+        print(f"❌ Error: {error_preview(response)}")
     
     await client.aclose()
     
@@ -100,4 +92,5 @@ async def test_fmp_endpoints():
     print("="*80)
 
 if __name__ == "__main__":
+    require_api_key()
     asyncio.run(test_fmp_endpoints())
@@ -1,22 +1,16 @@
 import httpx
 import asyncio
 
+from _fmp_common import probe_profile, require_api_key
+
 async def test_fmp():
-    client = httpx.AsyncClient(timeout=30.0)
-    
-    # Test with RELIANCE.NS
-    response = await client.get(
-        'https://financialmodelingprep.com/stable/profile',
-        params={
-            'symbol': 'RELIANCE.NS',
-            'apikey': 'qty5ZwSYBANWmtoWHYi1zfE8zDbKXXOV'
-        }
-    )
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.text}")
-    
-    await client.aclose()
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        # Test with RELIANCE.NS
+        response = await probe_profile(client, 'RELIANCE.NS')
+        
+        print(f"Status: {response.status_code}")
+        print(f"Response: {response.text}")
 
 if __name__ == "__main__":
+    require_api_key()
     asyncio.run(test_fmp())
@@ -14,159 +14,205 @@ Expected Behavior:
 
 import sys
 import os
+from collections import defaultdict
+from types import MappingProxyType
+
+import pytest
+
+from _buffered_output import buffered_stdout
 
 # Add frontend/lib to path for imports (mock TypeScript as Python dict)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'frontend', 'lib'))
 
+_DIGITS = frozenset('0123456789')
+
+# Core terms specified by user
+_CORE_TERMS: tuple[str, ...] = ('VWAP', 'RSI', 'Support', 'Resistance', 'Volume')
+_CORE_TERMS_SET = frozenset(_CORE_TERMS)
+
+# Relations each core term must link to (at least one of), kept apart from
+# the glossary under test so the relations check has something to compare
+_EXPECTED_RELATED: dict[str, frozenset[str]] = {
+    'VWAP': frozenset({'Volume', 'Support', 'Resistance'}),
+    'RSI': frozenset({'Momentum', 'Overbought', 'Oversold'}),
+    'Support': frozenset({'Resistance', 'Range', 'Bounce'}),
+    'Resistance': frozenset({'Support', 'Breakout', 'Range'}),
+    'Volume': frozenset({'VWAP', 'Liquidity', 'Breakout'})
+}
+
+
+# Simulated TECHNICAL_GLOSSARY structure (matches glossary.ts).
+# Built once at import; entries are read-only views shared by every test.
+_TECHNICAL_GLOSSARY: dict[str, MappingProxyType] = {
+    'VWAP': MappingProxyType({
+        'term': 'VWAP',
+        'fullName': 'Volume Weighted Average Price',
+        'definition': 'Average price weighted by volume traded throughout the day.',
+        'example': 'If VWAP is ₹2,550 and current price is ₹2,500...',
+        'category': 'technical',
+        'relatedTerms': ['Volume', 'Support', 'Resistance']
+    }),
+    'RSI': MappingProxyType({
+        'term': 'RSI',
+        'fullName': 'Relative Strength Index',
+        'definition': 'Momentum indicator measuring overbought/oversold conditions on a 0-100 scale.',
+        'example': 'RSI at 28 indicates oversold conditions...',
+        'category': 'technical',
+        'relatedTerms': ['Momentum', 'Overbought', 'Oversold']
+    }),
+    'Support': MappingProxyType({
+        'term': 'Support',
+        'definition': 'Price level where buying interest tends to emerge, preventing further declines.',
+        'example': 'If TCS bounces off ₹3,500 three times...',
+        'category': 'technical',
+        'relatedTerms': ['Resistance', 'Range', 'Bounce']
+    }),
+    'Resistance': MappingProxyType({
+        'term': 'Resistance',
+        'definition': 'Price level where selling pressure tends to emerge, preventing further gains.',
+        'example': 'If RELIANCE struggles to break ₹2,700 repeatedly...',
+        'category': 'technical',
+        'relatedTerms': ['Support', 'Breakout', 'Range']
+    }),
+    'Volume': MappingProxyType({
+        'term': 'Volume',
+        'definition': 'Number of shares traded in a given period.',
+        'example': 'Volume of 5 million shares (3x average) on an up day...',
+        'category': 'technical',
+        'relatedTerms': ['VWAP', 'Liquidity', 'Breakout']
+    })
+}
+
 
 def test_core_terms_present():
     """Test that all 5 specified terms are in glossary"""
     
-    # Core terms specified by user
-    required_terms = ['VWAP', 'RSI', 'Support', 'Resistance', 'Volume']
-    
-    # Simulate TECHNICAL_GLOSSARY structure (matches glossary.ts)
-    TECHNICAL_GLOSSARY = {
-        'VWAP': {
-            'term': 'VWAP',
-            'fullName': 'Volume Weighted Average Price',
-            'definition': 'Average price weighted by volume traded throughout the day.',
-            'example': 'If VWAP is ₹2,550 and current price is ₹2,500...',
-            'category': 'technical',
-            'relatedTerms': ['Volume', 'Support', 'Resistance']
-        },
-        'RSI': {
-            'term': 'RSI',
-            'fullName': 'Relative Strength Index',
-            'definition': 'Momentum indicator measuring overbought/oversold conditions on a 0-100 scale.',
-            'example': 'RSI at 28 indicates oversold conditions...',
-            'category': 'technical',
-            'relatedTerms': ['Momentum', 'Overbought', 'Oversold']
-        },
-        'Support': {
-            'term': 'Support',
-            'definition': 'Price level where buying interest tends to emerge, preventing further declines.',
-            'example': 'If TCS bounces off ₹3,500 three times...',
-            'category': 'technical',
-            'relatedTerms': ['Resistance', 'Range', 'Bounce']
-        },
-        'Resistance': {
-            'term': 'Resistance',
-            'definition': 'Price level where selling pressure tends to emerge, preventing further gains.',
-            'example': 'If RELIANCE struggles to break ₹2,700 repeatedly...',
-            'category': 'technical',
-            'relatedTerms': ['Support', 'Breakout', 'Range']
-        },
-        'Volume': {
-            'term': 'Volume',
-            'definition': 'Number of shares traded in a given period.',
-            'example': 'Volume of 5 million shares (3x average) on an up day...',
-            'category': 'technical',
-            'relatedTerms': ['VWAP', 'Liquidity', 'Breakout']
-        }
-    }
-    
-    missing_terms = []
-    for term in required_terms:
-        if term not in TECHNICAL_GLOSSARY:
-            missing_terms.append(term)
+    missing_terms = sorted(_CORE_TERMS_SET.difference(_TECHNICAL_GLOSSARY))
     
     assert len(missing_terms) == 0, f"Missing required terms: {missing_terms}"
     
     print("✅ Test 1 PASSED: All 5 core terms present")
-    print(f"   Terms: {', '.join(required_terms)}\n")
-    return TECHNICAL_GLOSSARY
+    print(f"   Terms: {', '.join(_CORE_TERMS)}\n")
+    return _TECHNICAL_GLOSSARY
 
 
-def test_plain_english_definitions(glossary):
-    """Test that definitions use plain English (no jargon without explanation)"""
+_VALID_CATEGORIES = ('technical', 'fundamental', 'risk', 'general')
+
+
+def _validate_glossary(glossary):
+    """
+    Run the definition/example/category/relation checks in one pass.
     
-    # Jargon words that need context
-    acceptable_technical_terms = ['price', 'volume', 'momentum', 'shares', 'average']
+    Returns error messages bucketed by check and then by term key, so
+    each test can assert on its own bucket.
+    """
+    errors = {check: defaultdict(list) for check in ('definitions', 'examples', 'categories', 'relations')}
+    
+    for key in _CORE_TERMS_SET.difference(glossary):
+        errors['examples'][key].append(f"Missing core term: {key}")
+        errors['categories'][key].append(f"{key}: Should be categorized as 'technical'")
+        errors['relations'][key].append(f"{key}: No related terms defined")
     
     for key, term in glossary.items():
-        definition = term['definition'].lower()
+        # Definitions should be explanatory, not just restate the term
+        definition = term['definition']
+        if len(definition) <= 30:
+            errors['definitions'][key].append(f"{key}: Definition too short ({len(definition)} chars)")
+        elif 'full_name' in term and term['term'].lower() in definition.lower() and len(definition) <= 50:
+            errors['definitions'][key].append(f"{key}: Definition doesn't explain beyond restating term")
         
-        # Check definition is not too short (should be explanatory)
-        assert len(definition) > 30, f"{key}: Definition too short ({len(definition)} chars)"
+        category = term.get('category')
+        if category is None:
+            errors['categories'][key].append(f"{key}: Missing category")
+        elif category not in _VALID_CATEGORIES:
+            errors['categories'][key].append(f"{key}: Invalid category '{category}'")
         
-        # Check definition explains the concept
-        # (Should not just restate the term)
-        if 'full_name' in term:
-            assert term['term'].lower() not in definition or len(definition) > 50, \
-                f"{key}: Definition doesn't explain beyond restating term"
-    
-    print("✅ Test 2 PASSED: All definitions use plain English")
-    print(f"   Checked {len(glossary)} terms for clarity\n")
-
-
-def test_examples_provided(glossary):
-    """Test that all core terms have real-world examples"""
-    
-    core_terms = ['VWAP', 'RSI', 'Support', 'Resistance', 'Volume']
-    
-    for term_key in core_terms:
-        term = glossary[term_key]
+        if key not in _CORE_TERMS_SET:
+            continue
         
-        # Check example exists
-        assert 'example' in term and term['example'], f"{term_key}: Missing example"
+        # Core terms should be 'technical'
+        if category != 'technical':
+            errors['categories'][key].append(f"{key}: Should be categorized as 'technical'")
         
-        # Check example uses Indian rupee symbol (₹) or real numbers
-        example = term['example']
-        has_context = '₹' in example or any(char.isdigit() for char in example)
-        assert has_context, f"{term_key}: Example lacks specific numbers/context"
+        # Examples should use ₹ amounts or real numbers and be descriptive
+        example = term.get('example')
+        if not example:
+            errors['examples'][key].append(f"{key}: Missing example")
+        elif not ('₹' in example or not _DIGITS.isdisjoint(example)):
+            errors['examples'][key].append(f"{key}: Example lacks specific numbers/context")
+        elif len(example) <= 30:
+            errors['examples'][key].append(f"{key}: Example too short ({len(example)} chars)")
         
-        # Check example is descriptive (not too short)
-        assert len(example) > 30, f"{term_key}: Example too short ({len(example)} chars)"
+        # Core terms should link to at least one expected related term
+        expected_related = _EXPECTED_RELATED[key]
+        related = term.get('relatedTerms', [])
+        if not related:
+            errors['relations'][key].append(f"{key}: No related terms defined")
+        elif expected_related.isdisjoint(related):
+            errors['relations'][key].append(f"{key}: Expected relations {sorted(expected_related)}, got {related}")
     
-    print("✅ Test 3 PASSED: All core terms have contextual examples")
-    print(f"   Verified {len(core_terms)} terms have ₹ amounts or specific numbers\n")
+    return errors
+
+
+@pytest.fixture(scope="module")
+def glossary():
+    """Simulated glossary shared by the per-term tests"""
+    return _TECHNICAL_GLOSSARY
+
+
+@pytest.fixture(scope="module")
+def glossary_errors(glossary):
+    """Single-pass check buckets, computed once for the per-term tests"""
+    return _validate_glossary(glossary)
 
 
-def test_category_tagging(glossary):
-    """Test that terms are properly categorized"""
+def test_plain_english_definitions(glossary, glossary_errors):
+    """Test that definitions use plain English (no jargon without explanation)"""
     
-    valid_categories = ['technical', 'fundamental', 'risk', 'general']
+    errors = [msg for msgs in glossary_errors['definitions'].values() for msg in msgs]
+    assert not errors, "; ".join(errors)
     
-    for key, term in glossary.items():
-        assert 'category' in term, f"{key}: Missing category"
-        assert term['category'] in valid_categories, \
-            f"{key}: Invalid category '{term['category']}'"
+    print("✅ Test 2 PASSED: All definitions use plain English")
+    print(f"   Checked {len(glossary)} terms for clarity\n")
+
+
+@pytest.mark.parametrize('term_key', _CORE_TERMS)
+def test_examples_provided(glossary, glossary_errors, term_key):
+    """Test that a core term has a real-world example"""
     
-    # Core terms should be 'technical'
-    core_terms = ['VWAP', 'RSI', 'Support', 'Resistance', 'Volume']
-    for term_key in core_terms:
-        assert glossary[term_key]['category'] == 'technical', \
-            f"{term_key}: Should be categorized as 'technical'"
+    errors = glossary_errors['examples'].get(term_key)
+    assert not errors, "; ".join(errors)
     
-    print("✅ Test 4 PASSED: All terms properly categorized")
-    print(f"   Valid categories: {', '.join(valid_categories)}\n")
+    print(f"✅ Test 3 PASSED: {term_key} example has ₹ amounts or specific numbers")
 
 
-def test_related_terms_network(glossary):
-    """Test that terms link to related concepts"""
+@pytest.mark.parametrize('term_key', sorted(_TECHNICAL_GLOSSARY))
+def test_category_tagging(glossary, glossary_errors, term_key):
+    """Test that a term is properly categorized"""
     
-    # Core terms should have related terms
-    core_with_relations = {
-        'VWAP': ['Volume', 'Support', 'Resistance'],
-        'RSI': ['Momentum', 'Overbought', 'Oversold'],
-        'Support': ['Resistance', 'Range', 'Bounce'],
-        'Resistance': ['Support', 'Breakout', 'Range'],
-        'Volume': ['VWAP', 'Liquidity', 'Breakout']
-    }
+    errors = glossary_errors['categories'].get(term_key)
+    assert not errors, "; ".join(errors)
     
-    for term_key, expected_related in core_with_relations.items():
-        term = glossary.get(term_key, {})
-        related = term.get('relatedTerms', [])
-        
-        assert len(related) > 0, f"{term_key}: No related terms defined"
-        
-        # Check at least one expected relation exists
-        has_expected = any(exp in related for exp in expected_related)
-        assert has_expected, f"{term_key}: Expected relations {expected_related}, got {related}"
+    print(f"✅ Test 4 PASSED: {term_key} is categorized as '{glossary[term_key]['category']}'")
+
+
+@pytest.mark.parametrize('term_key', _CORE_TERMS)
+def test_related_terms_network(glossary, glossary_errors, term_key):
+    """Test that a core term links to related concepts"""
+    
+    errors = glossary_errors['relations'].get(term_key)
+    assert not errors, "; ".join(errors)
     
-    print("✅ Test 5 PASSED: Related terms create knowledge network")
-    print(f"   Verified {len(core_with_relations)} core terms have relevant connections\n")
+    print(f"✅ Test 5 PASSED: {term_key} links to {', '.join(glossary[term_key]['relatedTerms'])}")
+
+
+def test_related_terms_check_uses_expected_table(glossary, monkeypatch):
+    """The relations check compares against _EXPECTED_RELATED, not the glossary itself"""
+
+    monkeypatch.setitem(_EXPECTED_RELATED, 'RSI', frozenset({'Dividend'}))
+
+    errors = _validate_glossary(glossary)['relations']
+    assert list(errors) == ['RSI'], dict(errors)
 
 
 def test_beginner_friendly_language():
@@ -189,7 +235,7 @@ def test_beginner_friendly_language():
     ]
     
     # Simulate checking definitions
-    all_good_phrases_found = len([p for p in good_phrases]) == 5
+    all_good_phrases_found = len(good_phrases) == 5
     no_forbidden_found = True  # None of the forbidden terms in our glossary
     
     assert all_good_phrases_found, "Missing beginner-friendly explanations"
@@ -204,29 +250,38 @@ def test_tooltip_component_structure():
     
     # Simulate TermTooltip component behavior
     class TermTooltip:
+        glossary = {
+            'RSI': {
+                'term': 'RSI',
+                'definition': 'Momentum indicator...',
+                'example': 'RSI at 28...'
+            }
+        }
+        
+        # Tooltip content only depends on the term, so build it once per class.
+        # Read-only views, so one render's caller can't change the next render.
+        _content = {
+            key: MappingProxyType({
+                'term': entry['term'],
+                'definition': entry['definition'],
+                'example': entry['example']
+            })
+            for key, entry in glossary.items()
+        }
+        
         def __init__(self, term, children):
             self.term = term
             self.children = children
-            self.glossary = {
-                'RSI': {
-                    'term': 'RSI',
-                    'definition': 'Momentum indicator...',
-                    'example': 'RSI at 28...'
-                }
-            }
         
         def render(self):
-            if self.term not in self.glossary:
+            content = self._content.get(self.term)
+            if content is None:
                 return {'type': 'span', 'children': self.children}
             
             return {
                 'type': 'tooltip',
                 'trigger': {'type': 'button', 'children': self.children},
-                'content': {
-                    'term': self.glossary[self.term]['term'],
-                    'definition': self.glossary[self.term]['definition'],
-                    'example': self.glossary[self.term]['example']
-                }
+                'content': content
             }
     
     # Test rendering
@@ -237,6 +292,9 @@ def test_tooltip_component_structure():
     assert rendered['content']['term'] == 'RSI', "Should show term name"
     assert 'definition' in rendered['content'], "Should include definition"
     assert 'example' in rendered['content'], "Should include example"
+    with pytest.raises(TypeError):
+        rendered['content']['term'] = 'changed'
+    assert TermTooltip('RSI', 'RSI').render()['content']['term'] == 'RSI', "Renders should not share mutable content"
     
     # Test unknown term fallback
     unknown_tooltip = TermTooltip('UNKNOWN_TERM', 'text')
@@ -288,40 +346,48 @@ def test_mobile_tap_support():
 
 def run_all_tests():
     """Run all glossary implementation tests"""
-    print("=" * 60)
-    print("Glossary Implementation Test Suite (Task 5)")
-    print("=" * 60)
-    print()
-    
-    glossary = test_core_terms_present()
-    test_plain_english_definitions(glossary)
-    test_examples_provided(glossary)
-    test_category_tagging(glossary)
-    test_related_terms_network(glossary)
-    test_beginner_friendly_language()
-    test_tooltip_component_structure()
-    test_mobile_tap_support()
-    
-    print("=" * 60)
-    print("✅ ALL TESTS PASSED (8/8)")
-    print("=" * 60)
-    print()
-    print("Summary:")
-    print("- 5 core terms implemented: VWAP, RSI, Support, Resistance, Volume")
-    print("- Plain English definitions with real-world examples")
-    print("- Related terms create knowledge network")
-    print("- Mobile-friendly (tap to show/hide)")
-    print("- Category tagging (Technical, Fundamental, Risk, General)")
-    print("- 20+ terms total (includes related: Momentum, Overbought, etc.)")
-    print()
-    print("Usage:")
-    print("  <TermTooltip term=\"RSI\">RSI</TermTooltip>")
-    print("  <InlineGlossary>RSI indicates oversold conditions</InlineGlossary>")
-    print()
-    print("Demo Page: /glossary-demo")
-    print("Integration Guide: docs/GLOSSARY_INTEGRATION_GUIDE.md")
-    print()
-    print("Glossary implementation complete! ✅")
+    with buffered_stdout():
+        print("=" * 60)
+        print("Glossary Implementation Test Suite (Task 5)")
+        print("=" * 60)
+        print()
+        
+        glossary = test_core_terms_present()
+        errors = _validate_glossary(glossary)
+        test_plain_english_definitions(glossary, errors)
+        for term_key in _CORE_TERMS:
+            test_examples_provided(glossary, errors, term_key)
+        print()
+        for term_key in glossary:
+            test_category_tagging(glossary, errors, term_key)
+        print()
+        for term_key in _CORE_TERMS:
+            test_related_terms_network(glossary, errors, term_key)
+        print()
+        test_beginner_friendly_language()
+        test_tooltip_component_structure()
+        test_mobile_tap_support()
+        
+        print("=" * 60)
+        print("✅ ALL TESTS PASSED (8/8)")
+        print("=" * 60)
+        print()
+        print("Summary:")
+        print("- 5 core terms implemented: VWAP, RSI, Support, Resistance, Volume")
+        print("- Plain English definitions with real-world examples")
+        print("- Related terms create knowledge network")
+        print("- Mobile-friendly (tap to show/hide)")
+        print("- Category tagging (Technical, Fundamental, Risk, General)")
+        print("- 20+ terms total (includes related: Momentum, Overbought, etc.)")
+        print()
+        print("Usage:")
+        print("  <TermTooltip term=\"RSI\">RSI</TermTooltip>")
+        print("  <InlineGlossary>RSI indicates oversold conditions</InlineGlossary>")
+        print()
+        print("Demo Page: /glossary-demo")
+        print("Integration Guide: docs/GLOSSARY_INTEGRATION_GUIDE.md")
+        print()
+        print("Glossary implementation complete! ✅")
 
 
 if __name__ == "__main__":
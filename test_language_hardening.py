@@ -9,10 +9,17 @@ Expected Behavior:
 - No command words (AVOID, HOLD)
 - Uses descriptive language (CONDITIONS UNFAVORABLE, SETUP NEUTRAL)
 - Maintains Option B confidence level
+
+Every assert here carries its own message, so pytest's assertion
+rewriting is skipped for this module: PYTEST_DONT_REWRITE
 """
 
-from datetime import datetime
-from decimal import Decimal
+import re
+
+# Urgency words that should NOT appear in recommendations. Matched as plain
+# substrings (no word boundaries) to keep the original strictness.
+_URGENCY_WORDS = ("NOW", "IMMEDIATELY", "URGENT", "MUST", "HURRY", "ASAP", "QUICKLY", "FAST")
+_URGENCY_RE = re.compile("|".join(_URGENCY_WORDS), re.IGNORECASE)
 
 
 def test_unfavorable_risk_reward():
@@ -119,15 +126,12 @@ def test_no_urgency_words_in_recommendations():
         "WEAK SELL SIGNAL - Limited downside probability. Monitor for confirmation.",
     ]
     
-    # Urgency words that should NOT appear
-    urgency_words = ["NOW", "IMMEDIATELY", "URGENT", "MUST", "HURRY", "ASAP", "QUICKLY", "FAST"]
-    
     for rec in recommendations:
-        for word in urgency_words:
-            assert word not in rec.upper(), f"Found urgency word '{word}' in: {rec}"
+        match = _URGENCY_RE.search(rec)
+        assert match is None, f"Found urgency word '{match.group(0)}' in: {rec}"
     
     print("✅ Test 5 PASSED: No urgency words found in any recommendations")
-    print(f"   Checked {len(recommendations)} recommendations against {len(urgency_words)} urgency words\n")
+    print(f"   Checked {len(recommendations)} recommendations against {len(_URGENCY_WORDS)} urgency words\n")
 
 
 def test_command_words_removed():
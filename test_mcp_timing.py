@@ -9,19 +9,39 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
 from app.core.context_agent.trigger_manager import MCPTriggerManager
 
+BAR = "=" * 80
+RULE = "-" * 80
+
+SUMMARY_BANNER = f"""
+{BAR}
+✅ MCP Timing & Caching Testing Complete!
+{BAR}
+
+Key Features Verified:
+  ✅ Explicit user clicks bypass cooldown
+  ✅ Signal change detection working
+  ✅ Login-based triggering (once per day)
+  ✅ Daily limit enforcement (max 10 per user)
+  ✅ Cache key generation consistent
+  ✅ Automatic triggers respect cooldown
+
+Execution Rules:
+  1. On Login: Once per day per user, only for changed signals
+  2. On Click: Immediate execution, bypasses cooldown
+  3. Automatic: Respects 5-min cooldown unless overridden
+  4. Caching: 5-min TTL, invalidated on signal change"""
+
 
 def test_mcp_timing_and_caching():
     """Test the new MCP execution timing rules and caching"""
     
-    print("=" * 80)
-    print("Testing MCP Execution Timing & Caching (Task 2)")
-    print("=" * 80)
+    print(f"{BAR}\nTesting MCP Execution Timing & Caching (Task 2)\n{BAR}")
     
     trigger_mgr = MCPTriggerManager(cooldown_minutes=5, cache_ttl_seconds=300)
     
     # Test Case 1: Explicit user click (always triggers)
     print("\n\n🔵 Test Case 1: Explicit User Click (Bypass Cooldown)")
-    print("-" * 80)
+    print(RULE)
     
     # First trigger
     result1 = trigger_mgr.should_trigger(
@@ -45,7 +65,7 @@ def test_mcp_timing_and_caching():
     
     # Test Case 2: Signal change detection
     print("\n\n🟢 Test Case 2: Signal Change Detection")
-    print("-" * 80)
+    print(RULE)
     
     trigger_mgr.reset_ticker("TCS.NS")
     
@@ -78,7 +98,7 @@ def test_mcp_timing_and_caching():
     
     # Test Case 3: Login-based triggering
     print("\n\n🟡 Test Case 3: Login-Based Triggering (Once Per Day)")
-    print("-" * 80)
+    print(RULE)
     
     # First login of the day
     result1 = trigger_mgr.should_trigger_on_login(
@@ -106,28 +126,30 @@ def test_mcp_timing_and_caching():
     
     # Test Case 4: Daily limit enforcement
     print("\n\n🔴 Test Case 4: Daily Limit Enforcement")
-    print("-" * 80)
+    print(RULE)
     
     trigger_mgr.reset_user_session("user789")
     
-    # Trigger 10 times (max limit)
-    triggered_count = 0
-    for i in range(12):
-        result = trigger_mgr.should_trigger_on_login(
+    # Trigger 10 times (max limit); the session keeps a running daily count,
+    # so each attempt is an O(1) check against it
+    attempts = [(f"STOCK{i}.NS", f"signal_{i}") for i in range(12)]
+    trigger_on_login = trigger_mgr.should_trigger_on_login
+    triggered_count = sum(
+        trigger_on_login(
             user_id="user789",
-            ticker=f"STOCK{i}.NS",
-            signal_hash=f"signal_{i}",
+            ticker=ticker,
+            signal_hash=signal_hash,
             max_daily_triggers=10
         )
-        if result:
-            triggered_count += 1
+        for ticker, signal_hash in attempts
+    )
     
     print(f"Triggered {triggered_count}/12 attempts (max: 10)")
     print(f"✅ Daily limit enforced: {triggered_count == 10}")
     
     # Test Case 5: Cache key generation
     print("\n\n🟣 Test Case 5: Cache Key Generation")
-    print("-" * 80)
+    print(RULE)
     
     cache_key1 = trigger_mgr.get_cache_key("RELIANCE.NS", "abc123")
     cache_key2 = trigger_mgr.get_cache_key("RELIANCE.NS", "abc123")
@@ -141,7 +163,7 @@ def test_mcp_timing_and_caching():
     
     # Test Case 6: Automatic trigger with cooldown
     print("\n\n⏰ Test Case 6: Automatic Trigger with Cooldown")
-    print("-" * 80)
+    print(RULE)
     
     trigger_mgr.reset_ticker("HDFCBANK.NS")
     
@@ -172,21 +194,7 @@ def test_mcp_timing_and_caching():
     )
     print(f"3rd auto trigger (type changed): {result3} ✅ (Expected: True - type changed)")
     
-    print("\n" + "=" * 80)
-    print("✅ MCP Timing & Caching Testing Complete!")
-    print("=" * 80)
-    print("\nKey Features Verified:")
-    print("  ✅ Explicit user clicks bypass cooldown")
-    print("  ✅ Signal change detection working")
-    print("  ✅ Login-based triggering (once per day)")
-    print("  ✅ Daily limit enforcement (max 10 per user)")
-    print("  ✅ Cache key generation consistent")
-    print("  ✅ Automatic triggers respect cooldown")
-    print("\nExecution Rules:")
-    print("  1. On Login: Once per day per user, only for changed signals")
-    print("  2. On Click: Immediate execution, bypasses cooldown")
-    print("  3. Automatic: Respects 5-min cooldown unless overridden")
-    print("  4. Caching: 5-min TTL, invalidated on signal change")
+    print(SUMMARY_BANNER)
 
 
 if __name__ == "__main__":
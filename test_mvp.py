@@ -2,16 +2,22 @@
 Quick test script to verify the Stock Intelligence Copilot MVP is working.
 
 Run this script to test all core functionality.
+
+For timing runs, `python -O test_mvp.py` strips every assert at compile
+time. Validation is skipped in that mode, so use a normal run to check
+correctness.
 """
 
 import sys
 from pathlib import Path
 
+from _buffered_output import buffered_stdout
+
 # Add backend to path
 backend_path = Path(__file__).parent / "backend"
 sys.path.insert(0, str(backend_path))
 
-from app.core.market_data import get_market_data_provider
+from app.core.market_data import get_market_data_provider, MockMarketDataProvider
 from app.core.indicators import indicator_calculator
 from app.core.signals import signal_generator
 from app.core.risk import risk_engine
@@ -20,6 +26,14 @@ from app.core.orchestrator import orchestrator
 from app.models.schemas import AnalysisRequest, TimeHorizon
 import asyncio
 
+# libuv-backed event loop when available (ships with uvicorn[standard];
+# not on Windows), otherwise the stock asyncio loop
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # Get the active market data provider
 market_data_provider = get_market_data_provider()
 
@@ -98,31 +112,69 @@ def test_explanation(signal, risk, indicators):
     return insight
 
 
+BAR = "=" * 60
+
+HEADER_BANNER = f"{BAR}\n🚀 Stock Intelligence Copilot - Component Tests\n{BAR}"
+SUCCESS_BANNER = f"""
+{BAR}
+✅ All Tests Passed!
+{BAR}
+
+🎉 Stock Intelligence Copilot MVP is fully operational!
+
+📝 Next Steps:
+   1. Run the server: cd backend && python main.py
+   2. Open docs: http://localhost:8000/docs
+   3. Test API: POST to /api/v1/stocks/analyze
+
+✨ Ready for Phase 2!"""
+
+
+# The live Alpha Vantage provider allows 5 calls a minute and raises instead of
+# waiting, so live runs analyse one ticker (2 calls with AAPL above)
+LIVE_DATA = not isinstance(market_data_provider, MockMarketDataProvider)
+BATCH_TICKERS = (
+    ["MSFT"] if LIVE_DATA
+    else ["AAPL", "MSFT", "GOOGL", "NVDA", "META", "TSLA", "AMZN"]
+)
+
+
 async def test_orchestrator():
-    """Test full pipeline orchestration"""
-    print("\n🔄 Testing Full Pipeline (Orchestrator)...")
-    request = AnalysisRequest(
-        ticker="MSFT",
-        time_horizon=TimeHorizon.LONG_TERM,
-        risk_tolerance="moderate",
-        lookback_days=90
+    """Test full pipeline orchestration across a batch of tickers"""
+    print(f"\n🔄 Testing Full Pipeline (Orchestrator) on {len(BATCH_TICKERS)} ticker(s)...")
+    requests = [
+        AnalysisRequest(
+            ticker=ticker,
+            time_horizon=TimeHorizon.LONG_TERM,
+            risk_tolerance="moderate",
+            lookback_days=90
+        )
+        for ticker in BATCH_TICKERS
+    ]
+    
+    # analyze_stock never awaits (its data fetch is synchronous), so on the
+    # running loop these run one after another; gather just collects every
+    # result so one failing ticker doesn't hide the rest
+    responses = await asyncio.gather(
+        *(orchestrator.analyze_stock(request) for request in requests),
+        return_exceptions=True
     )
     
-    response = await orchestrator.analyze_stock(request)
-    assert response.success
-    assert response.insight is not None
-    print(f"   ✅ Analysis completed in {response.processing_time_ms:.1f}ms")
-    print(f"   ✅ Ticker: {response.insight.ticker}")
-    print(f"   ✅ Signal: {response.insight.signal.strength.signal_type.value}")
-    print(f"   ✅ Risk: {response.insight.risk_assessment.overall_risk.value}")
-    return response
-
-
-def main():
+    for ticker, response in zip(BATCH_TICKERS, responses):
+        if isinstance(response, BaseException):
+            raise AssertionError(f"{ticker}: {response}") from response
+        assert response.success, f"{ticker}: analysis failed"
+        assert response.insight is not None
+        print(f"   ✅ {response.insight.ticker}: "
+              f"{response.insight.signal.strength.signal_type.value}, "
+              f"risk {response.insight.risk_assessment.overall_risk.value} "
+              f"({response.processing_time_ms:.1f}ms)")
+    return responses
+
+
+async def main():
     """Run all tests"""
-    print("=" * 60)
-    print("🚀 Stock Intelligence Copilot - Component Tests")
-    print("=" * 60)
+    print(HEADER_BANNER)
     
     try:
         # Test individual components
@@ -133,24 +185,17 @@ def main():
         insight = test_explanation(signal, risk, indicators)
         
         # Test full pipeline
-        response = asyncio.run(test_orchestrator())
+        responses = await test_orchestrator()
         
-        print("\n" + "=" * 60)
-        print("✅ All Tests Passed!")
-        print("=" * 60)
-        print("\n🎉 Stock Intelligence Copilot MVP is fully operational!")
-        print("\n📝 Next Steps:")
-        print("   1. Run the server: cd backend && python main.py")
-        print("   2. Open docs: http://localhost:8000/docs")
-        print("   3. Test API: POST to /api/v1/stocks/analyze")
-        print("\n✨ Ready for Phase 2!")
+        print(SUCCESS_BANNER)
         
     except Exception as e:
         print(f"\n❌ Test Failed: {str(e)}")
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=sys.stdout)
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with buffered_stdout():
+        asyncio.run(main())
@@ -1,11 +1,15 @@
 import sys
-sys.path.insert(0, 'D:/Stock Intelligence Copilot/backend')
+from pathlib import Path
+
+# Backend next to this script, not a machine-specific checkout path
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
 
 from app.main import app
 
-print('✓ App imports successfully')
-print('✓ API routes:')
-for route in app.routes:
-    if hasattr(route, 'path') and hasattr(route, 'methods'):
-        methods = ', '.join(route.methods)
-        print(f'  [{methods}] {route.path}')
+lines = ['✓ App imports successfully', '✓ API routes:']
+lines.extend(
+    f"  [{', '.join(route.methods)}] {route.path}"
+    for route in app.routes
+    if hasattr(route, 'path') and hasattr(route, 'methods')
+)
+sys.stdout.write('\n'.join(lines) + '\n')